@@ -3,22 +3,29 @@ Claude Codeの出力を解析するモジュール
 """
 import re
 import json
+import importlib.util
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, List, Dict
 from dataclasses import dataclass
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+
+def _module_available(name: str) -> bool:
+    """モジュールを実行せずにインストール済みかどうかだけ確認"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        # 親パッケージ（googleなど）が存在しない場合
+        return False
+
+
+# APIクライアントは重いので、ここでは有無の確認のみ行い、実際のimportは使用するプロバイダーの初期化時に行う
+ANTHROPIC_AVAILABLE = _module_available("anthropic")
+if not ANTHROPIC_AVAILABLE:
     print("Warning: anthropic package not available.")
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+GEMINI_AVAILABLE = _module_available("google.generativeai")
+if not GEMINI_AVAILABLE:
     print("Warning: google-generativeai package not available.")
 
 
@@ -36,20 +43,20 @@ class ClaudeResponse:
 class ClaudeOutputParser:
     """Claude Codeの出力を解析"""
 
-    # パターン定義
+    # パターン定義（呼び出しごとのパターンキャッシュ参照を避けるため事前コンパイル）
     QUESTION_PATTERNS = [
-        r'\?[^\n]*$',  # 末尾に?
-        r'(選択してください|選んでください|選択肢|どちらにしますか)',
-        r'(yes/no|y/n)',
-        r'\[.*\]\s*:?\s*$'  # [オプション] で終わる
+        re.compile(r'\?[^\n]*$', re.IGNORECASE),  # 末尾に?
+        re.compile(r'(選択してください|選んでください|選択肢|どちらにしますか)', re.IGNORECASE),
+        re.compile(r'(yes/no|y/n)', re.IGNORECASE),
+        re.compile(r'\[.*\]\s*:?\s*$', re.IGNORECASE)  # [オプション] で終わる
     ]
 
-    TODO_PATTERN = r'(\d+)/(\d+)\s*(completed|tasks?|done)'
+    TODO_PATTERN = re.compile(r'(\d+)/(\d+)\s*(completed|tasks?|done)', re.IGNORECASE)
 
     OPTION_PATTERNS = [
-        r'^\s*([0-9]+)[\.\)]\s+(.+)$',  # 1. オプション or 1) オプション
-        r'^\s*\[([A-Za-z0-9])\]\s+(.+)$',  # [A] オプション
-        r'^\s*-\s+(.+)$'  # - オプション
+        re.compile(r'^\s*([0-9]+)[\.\)]\s+(.+)$'),  # 1. オプション or 1) オプション
+        re.compile(r'^\s*\[([A-Za-z0-9])\]\s+(.+)$'),  # [A] オプション
+        re.compile(r'^\s*-\s+(.+)$')  # - オプション
     ]
 
     ERROR_KEYWORDS = [
@@ -57,12 +64,18 @@ class ClaudeOutputParser:
         'エラー', '失敗', '例外', 'できません'
     ]
 
+    # 要約キャッシュ（出力末尾のハッシュ -> API要約）
+    SUMMARY_CACHE_SIZE = 256
+    SUMMARY_CACHE_TAIL = 4000  # キーに使う末尾の文字数（スクロールによる先頭の変化を無視）
+    SUMMARY_FAILED = "要約の生成に失敗しました"  # APIが空の応答を返した場合の要約（キャッシュしない）
+
     def __init__(self):
         """初期化"""
         self.api_client = None
         self.gemini_model = None
         self.api_config = None
         self.api_provider = None  # 'anthropic' or 'gemini'
+        self._summary_cache: "OrderedDict[tuple, str]" = OrderedDict()  # LRU
         self._load_api_config()
 
     def _load_api_config(self):
@@ -96,6 +109,7 @@ class ClaudeOutputParser:
                 gemini_key = self.api_config.get('gemini_api_key')
                 if gemini_key and gemini_key != "your-gemini-api-key-here":
                     try:
+                        import google.generativeai as genai
                         genai.configure(api_key=gemini_key)
                         self.gemini_model = genai.GenerativeModel('gemini-2.5-flash')
                         self.api_provider = 'gemini'
@@ -110,6 +124,7 @@ class ClaudeOutputParser:
                 if ANTHROPIC_AVAILABLE and self.api_config.get('anthropic_api_key'):
                     api_key = self.api_config['anthropic_api_key']
                     if api_key and api_key != "your-api-key-here":
+                        from anthropic import Anthropic
                         self.api_client = Anthropic(api_key=api_key)
                         self.api_provider = 'anthropic'
                         # APIキーが設定済みの場合は成功メッセージのみ表示
@@ -190,7 +205,7 @@ class ClaudeOutputParser:
         last_lines = '\n'.join(lines[-5:])
 
         for pattern in self.QUESTION_PATTERNS:
-            if re.search(pattern, last_lines, re.IGNORECASE):
+            if pattern.search(last_lines):
                 return True
         return False
 
@@ -202,7 +217,7 @@ class ClaudeOutputParser:
         # 最後の20行程度をチェック
         for line in lines[-20:]:
             for pattern in self.OPTION_PATTERNS:
-                match = re.match(pattern, line.strip())
+                match = pattern.match(line.strip())
                 if match:
                     # オプションテキストを取得
                     if len(match.groups()) == 2:
@@ -216,7 +231,7 @@ class ClaudeOutputParser:
 
     def _extract_todo_status(self, text: str) -> Optional[Dict[str, int]]:
         """Todo進捗を抽出"""
-        match = re.search(self.TODO_PATTERN, text, re.IGNORECASE)
+        match = self.TODO_PATTERN.search(text)
         if match:
             completed = int(match.group(1))
             total = int(match.group(2))
@@ -238,8 +253,21 @@ class ClaudeOutputParser:
 
         # Claude APIまたはGemini APIが利用可能な場合はAPIで要約
         if (self.api_client or self.gemini_model) and self.api_config:
+            # 同じ出力に対する要約はキャッシュから返す（APIの重複呼び出しを防ぐ）
+            cache_key = (hash(text[-self.SUMMARY_CACHE_TAIL:]), max_length)
+            cached = self._summary_cache.get(cache_key)
+            if cached is not None:
+                self._summary_cache.move_to_end(cache_key)
+                return cached
+
             try:
-                return self._summarize_with_api(text, max_length)
+                summary = self._summarize_with_api(text, max_length)
+                # 失敗時の文言をキャッシュすると、同じ出力に対して再試行されなくなる
+                if summary != self.SUMMARY_FAILED:
+                    self._summary_cache[cache_key] = summary
+                    if len(self._summary_cache) > self.SUMMARY_CACHE_SIZE:
+                        self._summary_cache.popitem(last=False)
+                return summary
             except Exception as e:
                 print(f"API summarization failed: {e}, falling back to simple method")
                 # フォールバック: シンプルな要約方法を使用
@@ -421,7 +449,7 @@ class ClaudeOutputParser:
 
                 return summary
             else:
-                return "要約の生成に失敗しました"
+                return self.SUMMARY_FAILED
         else:
             raise Exception("No API client available")
 
@@ -9,6 +9,7 @@ APP_NAME = "Claude Code Monitor"
 WINDOW_WIDTH = 350
 WINDOW_HEIGHT = 800
 UPDATE_INTERVAL = 1000  # ミリ秒（1秒ごとに更新）
+MAX_UPDATE_INTERVAL = 5000  # ミリ秒（変化がない間は更新間隔をここまで倍々に延ばす）
 
 # 音声設定
 VOICE_LANGUAGE = "ja-JP"  # 日本語
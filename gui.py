@@ -2,9 +2,11 @@
 縦長モニタリングウィンドウのGUI
 """
 import sys
+import logging
+import re
 import tkinter as tk
 from tkinter import ttk, scrolledtext
-from typing import List, Callable, Optional
+from typing import List, Dict, Callable, Optional
 from datetime import datetime
 import threading
 import subprocess
@@ -14,10 +16,26 @@ import json
 from config import COLORS, WINDOW_WIDTH, WINDOW_HEIGHT, UPDATE_INTERVAL, APP_NAME
 from terminal_monitor import TerminalSession
 
+# ロガー（main.pyと共通、CCMON_DEBUG=1でデバッグ出力を有効化）
+log = logging.getLogger("ccmon")
+
+# 読み上げテキストを句読点で分割する正規表現（区切り文字もキャプチャして前の文に結合する）
+_SENTENCE_SPLIT_RE = re.compile(r'([。、！？])')
+
+# カード生成・更新のホットパスで使う色（辞書参照を毎回行わない）
+_BG = COLORS["bg"]
+_FG = COLORS["fg"]
+
 
 class SessionCard(tk.Frame):
     """各セッションを表示するカード"""
 
+    # Canvas内のレイアウト（ピクセル）
+    PAD_X = 10
+    HEADER_HEIGHT = 27
+    PROGRESS_HEIGHT = 21
+    SUMMARY_PAD_Y = 5
+
     def __init__(self, parent, session: TerminalSession, on_click: Callable, on_reorder: Callable = None, monitor_window=None):
         # 外側フレーム = 枠の色（ネストフレーム方式）
         super().__init__(parent, bg="#3a3a3a", bd=0, relief=tk.FLAT)
@@ -28,11 +46,12 @@ class SessionCard(tk.Frame):
         self.border_frame = self  # 外側フレーム（枠の色用）
         self.drag_start_y = 0  # ドラッグ開始位置
         self.is_dragging = False  # ドラッグ中フラグ
+        self.list_index = 0  # MonitorWindow.session_cards内の位置（MonitorWindowが更新）
 
         print(f"[DEBUG] SessionCard.__init__: {session.display_name}, status={session.status}")
 
         # 内側フレーム = コンテンツ（padding 3pxで枠を作る）
-        self.content_frame = tk.Frame(self, bg=COLORS["bg"])
+        self.content_frame = tk.Frame(self, bg=_BG)
         self.content_frame.pack(fill=tk.BOTH, expand=True, padx=3, pady=3)
 
         # 状態に応じた枠の色を設定
@@ -43,74 +62,131 @@ class SessionCard(tk.Frame):
         self._bind_drag_events()
 
     def _build_ui(self):
-        """UIを構築"""
-        # ヘッダー部分（content_frameに配置）
-        header_frame = tk.Frame(self.content_frame, bg=COLORS["bg"])
-        header_frame.pack(fill=tk.X, padx=10, pady=5)
+        """UIを構築（ヘッダー・進捗・要約を1つのCanvasに描画）"""
+        # MonitorWindowから初期高さを取得
+        self.summary_area_height = self.monitor_window.summary_area_height if self.monitor_window else 120
+
+        # 要約エリアの上端（進捗行はカード作成時にある場合のみ表示）
+        self._summary_top = self.HEADER_HEIGHT + (self.PROGRESS_HEIGHT if self.session.todo_progress else 0) + self.SUMMARY_PAD_Y
+        self._canvas_width = 0  # 前回のCanvas幅（リサイズ判定用）
+        self._summary_text = None  # 表示中の要約テキスト（変更検知用）
+        self._summary_overflow = 0  # 要約エリアに収まらない高さ（ピクセル）
+        self._summary_scroll = 0  # 下端揃えの位置から上方向にスクロールした量（ピクセル）
+
+        self.canvas = tk.Canvas(
+            self.content_frame,
+            bg=_BG,
+            highlightthickness=0,
+            height=self._summary_top + self.summary_area_height + self.SUMMARY_PAD_Y,
+            takefocus=0
+        )
+        self.canvas.pack(fill=tk.X)
+        canvas = self.canvas
+
+        # 最新出力プレビュー（背景 + テキスト、収まらない分はホイールでスクロール）
+        top = self._summary_top
+        self._summary_bg_item = canvas.create_rectangle(
+            self.PAD_X, top, self.PAD_X, top + self.summary_area_height,
+            fill="#2a2a2a", outline=""
+        )
+        self._summary_item = canvas.create_text(
+            self.PAD_X + 2, top,
+            anchor="nw",
+            text="",
+            font=("Courier", 8),
+            fill="#cccccc"
+        )
+
+        # ヘッダー背景（要約テキストが上にはみ出した部分を隠す）
+        self._header_bg_item = canvas.create_rectangle(0, 0, 0, top, fill=_BG, outline="")
+
+        # 下端の余白（スクロール時に要約テキストが下にはみ出した部分を隠す）
+        self._footer_bg_item = canvas.create_rectangle(
+            0, top + self.summary_area_height, 0, top + self.summary_area_height + self.SUMMARY_PAD_Y,
+            fill=_BG, outline=""
+        )
 
         # セッション名（タブ名 + ウィンドウID）
         display_text = f"{self.session.display_name} [{self.session.window_id}]"
-        self.name_label = tk.Label(
-            header_frame,
+        self._name_item = canvas.create_text(
+            self.PAD_X, 5,
+            anchor="nw",
             text=display_text,
             font=("Arial", 10, "bold"),
-            fg=COLORS["fg"],
-            bg=COLORS["bg"],
-            anchor="w"
+            fill=_FG
         )
-        self.name_label.pack(side=tk.LEFT)
 
-        # 状態表示（右上）
+        # 状態表示（右上、x座標はリサイズ時に決定）
         status_text = f"Status: {self.session.status}"
-        self.time_label = tk.Label(
-            header_frame,
+        self._time_item = canvas.create_text(
+            0, 7,
+            anchor="ne",
             text=status_text,
             font=("Arial", 8),
-            fg="#888888",
-            bg=COLORS["bg"],
-            anchor="e"
+            fill="#888888"
         )
-        self.time_label.pack(side=tk.RIGHT)
 
         # 進捗情報
         if self.session.todo_progress:
-            progress_frame = tk.Frame(self.content_frame, bg=COLORS["bg"])
-            progress_frame.pack(fill=tk.X, padx=10, pady=2)
-
-            progress_label = tk.Label(
-                progress_frame,
+            canvas.create_text(
+                self.PAD_X, self.HEADER_HEIGHT,
+                anchor="nw",
                 text=f"📋 {self.session.todo_progress}",
                 font=("Arial", 10),
-                fg=COLORS["fg"],
-                bg=COLORS["bg"],
-                anchor="w"
+                fill=_FG
             )
-            progress_label.pack(side=tk.LEFT)
 
-        # 最新出力プレビュー（スクロールなし）
-        # MonitorWindowから初期高さを取得
-        initial_height = self.monitor_window.summary_area_height if self.monitor_window else 120
-        self.output_frame = tk.Frame(self.content_frame, bg=COLORS["bg"], height=initial_height)
-        self.output_frame.pack(fill=tk.X, padx=10, pady=5)
-        self.output_frame.pack_propagate(False)  # 子要素によるサイズ変更を防止
-
-        self.output_text = tk.Text(
-            self.output_frame,
-            font=("Courier", 8),
-            fg="#cccccc",
-            bg="#2a2a2a",
-            wrap=tk.WORD,
-            relief=tk.FLAT,
-            borderwidth=0,
-            state=tk.DISABLED,  # フォーカスを受け取らない、編集不可
-            takefocus=0  # タブキーでもフォーカスされない
-        )
-        self.output_text.pack(fill=tk.BOTH, expand=True)
+        canvas.bind("<Configure>", self._on_canvas_configure)
+        canvas.bind("<MouseWheel>", self._on_summary_wheel)
 
         # 初期テキストを挿入（表示モードに応じて）
         self._update_output_display()
         print(f"    SessionCard created for {self.session.display_name}")
 
+    def _on_canvas_configure(self, event):
+        """Canvasの幅変更時に右寄せ・折り返し位置を更新"""
+        width = event.width
+        if width == self._canvas_width:
+            return
+        self._canvas_width = width
+
+        canvas = self.canvas
+        top = self._summary_top
+        canvas.coords(self._time_item, width - self.PAD_X, 7)
+        canvas.coords(self._header_bg_item, 0, 0, width, top)
+        canvas.coords(self._summary_bg_item, self.PAD_X, top, width - self.PAD_X, top + self.summary_area_height)
+        canvas.coords(self._footer_bg_item, 0, top + self.summary_area_height, width, top + self.summary_area_height + self.SUMMARY_PAD_Y)
+        canvas.itemconfigure(self._summary_item, width=max(width - 2 * (self.PAD_X + 2), 1))
+        self._layout_summary()
+
+    def _layout_summary(self):
+        """要約テキストを配置（収まらない場合は下端揃えを基準に、ホイールでスクロールした分だけ下げる）"""
+        canvas = self.canvas
+        top = self._summary_top
+
+        bbox = canvas.bbox(self._summary_item)
+        overflow = bbox[3] - bbox[1] - self.summary_area_height if bbox else 0
+        if overflow > 0:
+            self._summary_overflow = overflow
+            self._summary_scroll = min(self._summary_scroll, overflow)
+            canvas.coords(self._summary_item, self.PAD_X + 2, top - overflow + self._summary_scroll)
+        else:
+            self._summary_overflow = 0
+            self._summary_scroll = 0
+            canvas.coords(self._summary_item, self.PAD_X + 2, top)
+
+    def _on_summary_wheel(self, event):
+        """要約エリア上のホイールで収まらない要約をスクロール（その間はリスト全体をスクロールしない）"""
+        top = self._summary_top
+        if not self._summary_overflow or not top <= event.y <= top + self.summary_area_height:
+            return None
+
+        scroll = min(max(self._summary_scroll + event.delta, 0), self._summary_overflow)
+        if scroll != self._summary_scroll:
+            self._summary_scroll = scroll
+            self._layout_summary()
+        return "break"
+
     def _bind_click_events(self):
         """クリックイベントを全ての子ウィジェットにバインド"""
         # クリックイベントは_bind_drag_eventsで統合処理するため、ここでは何もしない
@@ -146,7 +222,7 @@ class SessionCard(tk.Frame):
                     self.on_reorder(self.session, direction)
                 self.is_dragging = False
                 if self.monitor_window:
-                    self.monitor_window.is_any_card_dragging = False
+                    self.monitor_window.end_card_drag()
                     print(f"[DRAG] End dragging, update resumed")
             else:
                 # クリック処理（移動距離が小さい場合）
@@ -184,7 +260,7 @@ class SessionCard(tk.Frame):
 
     def _update_border_color(self):
         """状態に応じた枠の色を設定"""
-        print(f"[DEBUG] _update_border_color: {self.session.display_name}, status={self.session.status}")
+        log.debug("[DEBUG] _update_border_color: %s, status=%s", self.session.display_name, self.session.status)
 
         # テスト用に分かりやすい色を使用
         if self.session.status == "active":
@@ -194,11 +270,11 @@ class SessionCard(tk.Frame):
         else:
             border_color = "#3a3a3a"  # 暗いグレー（アイドル）
 
-        print(f"  -> border_color={border_color}")
+        log.debug("  -> border_color=%s", border_color)
 
         # ネストフレーム方式：外側フレームの背景色を変更
         self.border_frame.config(bg=border_color)
-        print(f"  -> config applied (nested frame bg)")
+        log.debug("  -> config applied (nested frame bg)")
 
     def _truncate_output(self, text: str, max_length: int = 150) -> str:
         """出力を切り詰める"""
@@ -212,15 +288,12 @@ class SessionCard(tk.Frame):
 
     def _update_output_display(self):
         """要約を表示"""
-        self.output_text.config(state=tk.NORMAL)
-        self.output_text.delete("1.0", tk.END)
-
         # Claude APIによる要約を表示
         if self.session.summary:
             # Claude APIで生成された要約を使用（改行はそのまま保持）
             summary_text = self.session.summary.strip()
 
-            print(f"    Summary mode (API): {self.session.display_name}, showing API summary")
+            log.debug("    Summary mode (API): %s, showing API summary", self.session.display_name)
         else:
             # フォールバック：要約がない場合は簡易サマリー
             full_output = self.session.last_output if self.session.last_output else ""
@@ -230,14 +303,11 @@ class SessionCard(tk.Frame):
             if self.session.todo_progress:
                 summary_parts.append(f"Progress: {self.session.todo_progress}")
 
-            # 最新100文字を追加
+            # 最新100文字を追加（有効行はセッション更新時に計算済み）
             if full_output:
-                lines = full_output.strip().split('\n')
-                relevant_lines = [line for line in reversed(lines) if line.strip() and not line.startswith('$')][:3]
-                relevant_lines.reverse()
+                latest = '\n'.join(self.session.recent_relevant_lines)
 
-                if relevant_lines:
-                    latest = '\n'.join(relevant_lines)
+                if latest:
                     if len(latest) > 100:
                         latest = latest[-100:]
                     summary_parts.append(f"\nLatest output:\n{latest}")
@@ -247,19 +317,27 @@ class SessionCard(tk.Frame):
                 summary_parts.append("\n(No output)")
 
             summary_text = '\n'.join(summary_parts)
-            print(f"    Summary mode (fallback): {self.session.display_name}, showing fallback summary")
+            log.debug("    Summary mode (fallback): %s, showing fallback summary", self.session.display_name)
 
-        self.output_text.insert("1.0", summary_text)
+        # 内容が変わっていなければCanvasに触らない
+        if summary_text == self._summary_text:
+            return
+        self._summary_text = summary_text
+        self._summary_scroll = 0  # 内容が変わったら最下部を表示
 
-        # 最下部にスクロール
-        self.output_text.see(tk.END)
-        self.output_text.config(state=tk.DISABLED)
+        self.canvas.itemconfigure(self._summary_item, text=summary_text)
+        self._layout_summary()
 
     def update_output_frame_height(self, height: int):
         """要約エリアの高さを更新"""
-        if hasattr(self, 'output_frame'):
-            self.output_frame.config(height=height)
-            print(f"    Updated output_frame height for {self.session.display_name}: {height}px")
+        if hasattr(self, 'canvas'):
+            self.summary_area_height = height
+            top = self._summary_top
+            self.canvas.config(height=top + height + self.SUMMARY_PAD_Y)
+            self.canvas.coords(self._summary_bg_item, self.PAD_X, top, self._canvas_width - self.PAD_X, top + height)
+            self.canvas.coords(self._footer_bg_item, 0, top + height, self._canvas_width, top + height + self.SUMMARY_PAD_Y)
+            self._layout_summary()
+            print(f"    Updated summary area height for {self.session.display_name}: {height}px")
 
     def update_session(self, session: TerminalSession):
         """セッション情報を更新"""
@@ -270,13 +348,13 @@ class SessionCard(tk.Frame):
 
         self.session = session
 
-        print(f"[DEBUG] update_session: {old_name} -> {session.display_name}")
-        print(f"  Old: window_id={old_window_id}, tab_index={old_tab_index}, status={old_status}")
-        print(f"  New: window_id={session.window_id}, tab_index={session.tab_index}, status={session.status}")
+        log.debug("[DEBUG] update_session: %s -> %s", old_name, session.display_name)
+        log.debug("  Old: window_id=%s, tab_index=%s, status=%s", old_window_id, old_tab_index, old_status)
+        log.debug("  New: window_id=%s, tab_index=%s, status=%s", session.window_id, session.tab_index, session.status)
 
         # 各要素を更新（ウィンドウID）
         display_text = f"{session.display_name} [{session.window_id}]"
-        self.name_label.config(text=display_text)
+        self.canvas.itemconfigure(self._name_item, text=display_text)
 
         # 枠の色を更新（状態に応じて）
         self._update_border_color()
@@ -286,11 +364,11 @@ class SessionCard(tk.Frame):
 
         # 状態表示を更新（Updatedは表示しない）
         status_text = f"Status: {session.status}"
-        self.time_label.config(text=status_text)
+        self.canvas.itemconfigure(self._time_item, text=status_text)
 
         # クリックイベントを再バインド（更新後も確実にクリック可能に）
         self._bind_click_events()
-        print(f"[DEBUG] Click events rebound for {session.display_name}")
+        log.debug("[DEBUG] Click events rebound for %s", session.display_name)
 
 
 class MonitorWindow:
@@ -316,6 +394,7 @@ class MonitorWindow:
 
         # ドラッグ中フラグ（更新処理の一時停止用）
         self.is_any_card_dragging = False
+        self._skipped_sessions = None  # ドラッグ中に届いた最新のセッション一覧（ドラッグ終了時に反映）
 
         # 設定ファイルのパス
         self.config_file_path = "config.json"
@@ -342,6 +421,7 @@ class MonitorWindow:
         self.root.after(50, _initial_focus)
 
         self.session_cards: List[SessionCard] = []
+        self._card_index: Dict[int, SessionCard] = {}  # session.key -> カード
 
         self._build_ui()
 
@@ -815,7 +895,6 @@ class MonitorWindow:
             elif self.tts_mode == "voicevox":
                 # VOICEVOX (ずんだもん: speaker_id=3) - PyAudioで連続再生
                 import requests
-                import re
                 import tempfile
                 import wave
                 import pyaudio
@@ -826,7 +905,7 @@ class MonitorWindow:
                 speaker_id = 3  # ずんだもん
 
                 # テキストを句読点で分割
-                sentences = re.split(r'([。、！？])', text)
+                sentences = _SENTENCE_SPLIT_RE.split(text)
                 # 区切り文字を前の文に結合
                 merged_sentences = []
                 for i in range(0, len(sentences), 2):
@@ -953,19 +1032,22 @@ class MonitorWindow:
         finally:
             self.tts_process = None
 
+    def end_card_drag(self):
+        """ドラッグ終了時に更新を再開し、ドラッグ中に保留した更新があれば反映"""
+        self.is_any_card_dragging = False
+        skipped_sessions = self._skipped_sessions
+        if skipped_sessions is not None:
+            self.update_sessions(skipped_sessions)
+
     def _on_card_reorder(self, session: TerminalSession, direction: str):
         """カードの並び替え"""
         print(f"[REORDER] Moving {session.display_name} {direction}")
 
         # 現在のカードのインデックスを取得
-        current_index = None
-        for i, card in enumerate(self.session_cards):
-            if card.session.window_id == session.window_id and card.session.tab_index == session.tab_index:
-                current_index = i
-                break
-
-        if current_index is None:
+        card = self._card_index.get(session.key)
+        if card is None:
             return
+        current_index = card.list_index
 
         # 新しいインデックスを計算
         new_index = current_index - 1 if direction == "up" else current_index + 1
@@ -976,22 +1058,25 @@ class MonitorWindow:
         self.session_cards[current_index], self.session_cards[new_index] = \
             self.session_cards[new_index], self.session_cards[current_index]
 
-        # display_orderを更新
+        # display_orderと位置を更新
         for i, card in enumerate(self.session_cards):
+            card.list_index = i
             card.session.display_order = i + 1
             print(f"  [{i+1}] {card.session.display_name}, display_order={card.session.display_order}")
 
-        # カードを再配置
-        for card in self.session_cards:
-            card.pack_forget()
-        for card in self.session_cards:
-            card.pack(fill=tk.X, pady=5, padx=5)
+        # 入れ替えた隣接2枚だけを再配置（上に来たカードを下のカードの前へ移動）
+        upper_card = self.session_cards[min(current_index, new_index)]
+        lower_card = self.session_cards[max(current_index, new_index)]
+        upper_card.pack_configure(before=lower_card)
 
         # main.pyのsession_mapを更新するコールバックを呼び出す
         if self.on_reorder_complete:
             sessions = [card.session for card in self.session_cards]
             self.on_reorder_complete(sessions)
 
+        # 保留中の更新は並び替え前の順序なので捨てる（並び順が変わるため強制更新で最新状態が再送される）
+        self._skipped_sessions = None
+
         # ドロップ直後に画面を即座に更新（2回連続ドラッグ対策）
         # 100ms後に強制更新をトリガー
         self.root.after(100, self._force_update_after_reorder)
@@ -1020,9 +1105,13 @@ class MonitorWindow:
             lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         )
 
-        # Canvasのリサイズ時に横幅を更新
+        # Canvasのリサイズ時に横幅を更新（幅が変わらない場合は再レイアウトしない）
+        self._last_canvas_width = None
+
         def _on_canvas_configure(event):
-            self.canvas.itemconfig(self.canvas_window, width=event.width)
+            if event.width != self._last_canvas_width:
+                self._last_canvas_width = event.width
+                self.canvas.itemconfigure(self.canvas_window, width=event.width)
 
         self.canvas.bind("<Configure>", _on_canvas_configure)
 
@@ -1036,8 +1125,22 @@ class MonitorWindow:
         # トラックパッドスクロール用のアキュムレータ（小数点以下を蓄積）
         self._scroll_accumulator = 0.0
 
+        # マウスホイールイベントを10msごとにまとめてスクロール（再描画の連発を防ぐ）
+        self._wheel_accum = 0
+        self._wheel_scheduled = False
+
+        def _flush_wheel():
+            self._wheel_scheduled = False
+            step = self._wheel_accum
+            self._wheel_accum = 0
+            if step != 0:
+                self.canvas.yview_scroll(step, "units")
+
         def _on_mousewheel(event):
-            self.canvas.yview_scroll(int(-1 * event.delta), "units")
+            self._wheel_accum += int(-1 * event.delta)
+            if not self._wheel_scheduled:
+                self._wheel_scheduled = True
+                self.root.after(10, _flush_wheel)
 
         def _on_touchpad(event):
             # event.deltaは32bitに圧縮されたdx,dyを含む
@@ -1066,12 +1169,17 @@ class MonitorWindow:
         self.canvas.bind_all("<MouseWheel>", _on_mousewheel, add="+")
         self.canvas.bind_all("<TouchpadScroll>", _on_touchpad, add="+")
 
-        # デバッグ: 全てのクリックを検出
-        self.root.bind_all("<Button-1>", lambda e: print(f"[DEBUG] Global click detected on: {e.widget.__class__.__name__} ({e.widget})"))
+        # デバッグ: 全てのクリックを検出（CLAUDE_GUI_DEBUG=1の場合のみ）
+        if os.environ.get("CLAUDE_GUI_DEBUG"):
+            self.root.bind_all("<Button-1>", self._debug_click_tap, add="+")
 
         # 定期的にフォーカス状態をチェック（5秒ごと）
         self._check_focus_periodically()
 
+    def _debug_click_tap(self, event):
+        """全クリックのデバッグ出力（CLAUDE_GUI_DEBUG=1の場合のみバインド）"""
+        print(f"[DEBUG] Global click detected on: {event.widget.__class__.__name__} ({event.widget})")
+
     def _check_focus_periodically(self):
         """定期的にフォーカス状態をチェック"""
         try:
@@ -1086,29 +1194,32 @@ class MonitorWindow:
 
     def update_sessions(self, sessions: List[TerminalSession]):
         """セッションリストを更新（既存カードを再利用し、順序を保持）"""
-        # ドラッグ中は更新をスキップ
+        # ドラッグ中は更新を保留（次の更新が来るまで再送されないので、ドラッグ終了時に反映する）
         if self.is_any_card_dragging:
-            print(f"  MonitorWindow.update_sessions SKIPPED (dragging in progress)")
+            self._skipped_sessions = sessions
+            log.debug("  MonitorWindow.update_sessions SKIPPED (dragging in progress)")
             return
+        self._skipped_sessions = None
 
-        print(f"  MonitorWindow.update_sessions called with {len(sessions)} sessions")
-        for i, s in enumerate(sessions):
-            print(f"    Session {i+1}: {s.display_name}, window_id={s.window_id}, tab_index={s.tab_index}, output_len={len(s.last_output)}")
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            log.debug("  MonitorWindow.update_sessions called with %s sessions", len(sessions))
+            for i, s in enumerate(sessions):
+                log.debug("    Session %s: %s, window_id=%s, tab_index=%s, output_len=%s", i+1, s.display_name, s.window_id, s.tab_index, len(s.last_output))
 
-        # 既存カードをキーでマップ
-        card_map = {(card.session.window_id, card.session.tab_index): card for card in self.session_cards}
+        card_index = self._card_index
 
         # 新しいカードリストを作成（sessionsの順序通り）
         new_cards = []
         for session in sessions:
-            session_key = (session.window_id, session.tab_index)
+            session_key = session.key
 
-            if session_key in card_map:
+            if session_key in card_index:
                 # 既存カードを再利用して更新
-                card = card_map[session_key]
+                card = card_index[session_key]
                 card.update_session(session)
                 new_cards.append(card)
-                print(f"    Reusing card: {session.display_name}")
+                log.debug("    Reusing card: %s", session.display_name)
             else:
                 # 新規カード作成
                 card = SessionCard(
@@ -1119,26 +1230,31 @@ class MonitorWindow:
                     monitor_window=self
                 )
                 new_cards.append(card)
-                print(f"    Created new card: {session.display_name}")
+                log.debug("    Created new card: %s", session.display_name)
 
         # 削除されたセッションのカードを破棄
-        current_keys = {(s.window_id, s.tab_index) for s in sessions}
+        current_keys = {s.key for s in sessions}
         for old_card in self.session_cards:
-            old_key = (old_card.session.window_id, old_card.session.tab_index)
+            old_key = old_card.session.key
             if old_key not in current_keys:
+                del card_index[old_key]
                 old_card.destroy()
-                print(f"    Removed card: {old_card.session.display_name}")
+                log.debug("    Removed card: %s", old_card.session.display_name)
 
         # 既存のカードを全て削除
         for old_card in self.session_cards:
             old_card.pack_forget()
 
         # 新しい順序でカードを配置
+        fill_x = tk.X
         for i, card in enumerate(new_cards):
-            card.pack(fill=tk.X, pady=5, padx=5)
-            summary_preview = card.session.summary[:50] if card.session.summary else "(no summary)"
-            print(f"    Packed card at position {i+1}: {card.session.display_name} (window_id={card.session.window_id}, tab_index={card.session.tab_index})")
-            print(f"      Summary preview: {summary_preview}")
+            card.pack(fill=fill_x, pady=5, padx=5)
+            card.list_index = i
+            card_index[card.session.key] = card
+            if debug:
+                summary_preview = card.session.summary[:50] if card.session.summary else "(no summary)"
+                log.debug("    Packed card at position %s: %s (window_id=%s, tab_index=%s)", i+1, card.session.display_name, card.session.window_id, card.session.tab_index)
+                log.debug("      Summary preview: %s", summary_preview)
 
         # カードリストを更新
         self.session_cards = new_cards
@@ -1246,7 +1362,8 @@ if __name__ == "__main__":
             last_output="Running tests... All passed!",
             status="active",
             todo_progress="3/5 completed",
-            last_updated=datetime.now()
+            last_updated=datetime.now(),
+            recent_relevant_lines=("Running tests... All passed!",)
         ),
         TerminalSession(
             window_id=1,
@@ -5,21 +5,31 @@ Claude Code Monitor - メインアプリケーション
 複数のTerminal.appタブ/ウィンドウでClaude Codeを実行し、
 音声で操作できるモニタリングシステム
 """
+import os
 import sys
+import logging
 import threading
-import time
 import queue
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
-# 標準出力のバッファリングを無効化（デバッグ用）
-sys.stdout.reconfigure(line_buffering=True)
-sys.stderr.reconfigure(line_buffering=True)
-
-from config import UPDATE_INTERVAL
+from config import UPDATE_INTERVAL, MAX_UPDATE_INTERVAL
 from terminal_monitor import TerminalMonitor, TerminalSession
 from gui import MonitorWindow
 from claude_parser import ClaudeOutputParser
 
+# ロガー（CCMON_DEBUG=1でデバッグ出力を有効化）
+log = logging.getLogger("ccmon")
+
+# この状態に切り替わったときに要約を生成する
+_TRIGGER_STATES = frozenset(("idle", "waiting"))
+
+
+def _snapshot_sessions(sessions: List[TerminalSession]) -> List[TerminalSession]:
+    """GUIに渡すセッションのコピーを作る（更新スレッドが書き換えるsession_mapのオブジェクトをGUIと共有しない）"""
+    return [dataclasses.replace(s) for s in sessions]
+
 
 class ClaudeCodeController:
     """メインコントローラー"""
@@ -30,42 +40,45 @@ class ClaudeCodeController:
         self.gui_window = None
         self.is_running = False
         self.update_thread = None
-        self.update_queue = queue.Queue()  # スレッド間通信用キュー
-        self.session_map = {}  # {(window_id, tab_index): TerminalSession} セッション永続化用
+        self._latest_sessions = None  # GUIに未反映の最新セッション一覧（古いものは上書きして捨てる）
+        self._latest_lock = threading.Lock()
+        self.session_map = {}  # {session.key: TerminalSession} セッション永続化用（更新スレッドのみが読み書き）
         self.next_display_order = 1  # 次に割り当てるdisplay_order
-        self.force_update_flag = False  # 強制更新フラグ
+        self._ordered_keys = []  # display_order順のセッションキー（更新スレッドのみが読み書き）
+        self._reorder_requests = queue.SimpleQueue()  # GUIからの並び替え結果 [(session_key, display_order), ...]
+        self._published_keys = []  # 前回GUIに渡したセッションキー（変化がない周期はGUI更新を省略）
+        self._wake = threading.Event()  # 強制更新・停止時に更新ループを即座に起こす
+        self._content_hash_map = {}  # {session.key: タブ内容のハッシュ} 未変更タブの再解析スキップ用
+        self.summary_thread = None
+        self._switch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ccmon-switch")  # クリックによる切り替えを順番に実行
+        self._summary_cond = threading.Condition()  # 要約ワーカーとの同期用
+        self._summary_requests = {}  # {session_key: (出力, 前回の状態, 読み上げるか)} セッションごとに最新のみ保持
+        self._summary_results = {}  # {session_key: (要約, 前回の状態, 読み上げるか)} update_loopが次の周期で反映
 
     def start(self):
         """アプリケーションを起動"""
-        print("Starting Claude Code Monitor...")
+        log.info("Starting Claude Code Monitor...")
 
-        # 初回のセッション検出
-        sessions = self.terminal_monitor.detect_sessions()
-        print(f"Found {len(sessions)} terminal sessions")
-
-        # Claude Codeセッションのみ抽出してID順にソート
-        claude_sessions = [s for s in sessions if s.is_running_claude]
+        # 初回のセッション検出と内容取得（Claude Codeセッションのみ）を1回のAppleScriptで行い、ID順にソート
+        claude_sessions, tab_contents = self.terminal_monitor.detect_sessions_with_contents(claude_only=True)
         claude_sessions_sorted = sorted(claude_sessions, key=lambda s: s.window_id)
-        print(f"Claude Code sessions: {len(claude_sessions_sorted)}")
+        log.info("Claude Code sessions: %s", len(claude_sessions_sorted))
 
         # 初回のdisplay_orderを割り当て、かつ詳細情報を取得
         for i, session in enumerate(claude_sessions_sorted, start=1):
             session.display_order = i
 
-            # analyze_session_statusを呼び出して実際の出力を取得
-            analyzed_session = self.terminal_monitor.analyze_session_status(session)
+            # 取得済みの内容で状態を分析（タブごとのAppleScript呼び出しは行わない）
+            self.terminal_monitor.analyze_session_status(session, tab_contents.get(session.key, ""))
 
             # 起動時は要約を生成せず、"~要約中~"と表示
-            if analyzed_session.last_output:
-                analyzed_session.summary = "~要約中~"
-                print(f"  Initial session marked for summarization")
-
-            session_key = (analyzed_session.window_id, analyzed_session.tab_index)
-            self.session_map[session_key] = analyzed_session
-            print(f"  Initial session [{i}]: window_id={analyzed_session.window_id}, display_order={analyzed_session.display_order}, output_len={len(analyzed_session.last_output)}")
+            if session.last_output:
+                session.summary = "~要約中~"
+                log.info("  Initial session marked for summarization")
 
-            # ソート済みリストも更新
-            claude_sessions_sorted[i-1] = analyzed_session
+            self.session_map[session.key] = session
+            self._ordered_keys.append(session.key)
+            log.info("  Initial session [%s]: window_id=%s, display_order=%s, output_len=%s", i, session.window_id, session.display_order, len(session.last_output))
 
         self.next_display_order = len(claude_sessions_sorted) + 1
 
@@ -77,9 +90,9 @@ class ClaudeCodeController:
         # 少なくとも1つのAPIキーが設定されていればTrue
         api_key_configured = gemini_configured or anthropic_configured
 
-        print(f"[API] Gemini configured: {gemini_configured}")
-        print(f"[API] Anthropic configured: {anthropic_configured}")
-        print(f"[API] API key configured: {api_key_configured}")
+        log.info("[API] Gemini configured: %s", gemini_configured)
+        log.info("[API] Anthropic configured: %s", anthropic_configured)
+        log.info("[API] API key configured: %s", api_key_configured)
 
         # GUIウィンドウを作成
         self.gui_window = MonitorWindow(
@@ -91,7 +104,10 @@ class ClaudeCodeController:
         )
 
         # 初期セッション表示（要約なしで即座に表示）
-        self.gui_window.update_sessions(claude_sessions_sorted)
+        self.gui_window.update_sessions(_snapshot_sessions(claude_sessions_sorted))
+
+        # 更新スレッドからの通知（仮想イベント）でGUIに反映
+        self.gui_window.root.bind("<<SessionsUpdated>>", self._deliver_latest)
 
         # 起動フラグ（最初の1回は必ず要約を生成）
         self.is_first_update = True
@@ -101,240 +117,357 @@ class ClaudeCodeController:
         self.update_thread = threading.Thread(target=self.update_loop, daemon=True)
         self.update_thread.start()
 
-        print("Application started. Monitoring sessions...")
+        # 要約生成スレッド開始（API呼び出しで更新ループを止めない）
+        self.summary_thread = threading.Thread(target=self._summary_worker, daemon=True)
+        self.summary_thread.start()
 
-        # メインスレッドでキューチェックを定期実行
-        self._check_updates()
+        log.info("Application started. Monitoring sessions...")
 
         # GUIメインループ開始
         try:
             self.gui_window.run()
         except KeyboardInterrupt:
-            print("\nShutting down...")
+            log.info("Shutting down...")
         finally:
             self.stop()
 
     def stop(self):
         """アプリケーションを停止"""
         self.is_running = False
-        print("Application stopped")
+        self._wake.set()
+        with self._summary_cond:
+            self._summary_cond.notify_all()
+        self._switch_executor.shutdown(wait=False)
+        log.info("Application stopped")
+
+    def _request_summary(self, session_key, output: str, previous_status, speak: bool):
+        """要約生成をワーカーに依頼（同じセッションの古い依頼は破棄）"""
+        with self._summary_cond:
+            self._summary_requests[session_key] = (output, previous_status, speak)
+            self._summary_cond.notify()
+
+    def _summary_worker(self):
+        """要約をバックグラウンドで生成し、結果をupdate_loopに渡す"""
+        while True:
+            with self._summary_cond:
+                while self.is_running and not self._summary_requests:
+                    self._summary_cond.wait()
+                if not self.is_running:
+                    return
+                session_key = next(iter(self._summary_requests))
+                output, previous_status, speak = self._summary_requests.pop(session_key)
+
+            try:
+                summary = self.claude_parser.summarize(output)
+                log.debug("  [SUMMARY] Summary generated for %s: %s...", session_key, summary[:50])
+            except Exception as e:
+                log.error("Error in summary worker: %s", e)
+                continue
+
+            # 結果を渡して更新ループを即座に起こす
+            with self._summary_cond:
+                self._summary_results[session_key] = (summary, previous_status, speak)
+            self._wake.set()
+
+    def _apply_reorder_requests(self):
+        """GUIでの並び替え結果をsession_mapと表示順に反映（更新スレッドで実行）"""
+        order = None
+        while not self._reorder_requests.empty():
+            order = self._reorder_requests.get_nowait()  # 最新の並び順のみ使う
+        if order is None:
+            return
+
+        for session_key, display_order in order:
+            session = self.session_map.get(session_key)
+            if session is not None:
+                session.display_order = display_order
+                log.debug("  Updated session_map: %s, display_order=%s", session.display_name, display_order)
+
+        # 表示中のセッションを新しい順に並べ、非表示のセッションはその後ろに残す
+        shown_keys = [session_key for session_key, _ in order]
+        shown_key_set = set(shown_keys)
+        self._ordered_keys = shown_keys + [key for key in self._ordered_keys if key not in shown_key_set]
+
+    def _evict_closed_sessions(self, current_sessions: dict):
+        """今回検出されなかったセッションをsession_map・表示順・内容ハッシュ・要約依頼から削除（更新スレッドで実行）"""
+        closed_keys = [key for key in self.session_map if key not in current_sessions]
+        for key in closed_keys:
+            log.debug("  Evicting closed session: %s", self.session_map[key].display_name)
+            del self.session_map[key]
+            self._content_hash_map.pop(key, None)
+        self._ordered_keys = [key for key in self._ordered_keys if key in current_sessions]
+
+        # 閉じたタブの未処理の要約依頼も破棄（APIを呼んでも結果は捨てられるだけ）
+        if closed_keys:
+            with self._summary_cond:
+                for key in closed_keys:
+                    self._summary_requests.pop(key, None)
+
+    def _apply_summary_results(self) -> bool:
+        """要約ワーカーの結果をsession_mapに反映し、必要なら読み上げる（反映があればTrue）"""
+        with self._summary_cond:
+            results = self._summary_results
+            self._summary_results = {}
+
+        for session_key, (summary, previous_status, speak) in results.items():
+            session = self.session_map.get(session_key)
+            if session is None:
+                continue
+            session.summary = summary
+
+            # 要約生成完了後に読み上げ
+            if speak and self.gui_window:
+                log.debug("    [TTS] Triggering speech for status change (after summary)")
+                self.gui_window.speak_status_change(session, previous_status)
+
+        return bool(results)
+
+    def _publish_sessions(self, sessions: List[TerminalSession]):
+        """最新のセッション一覧のコピーを渡し、未通知ならメインスレッドに仮想イベントで通知"""
+        sessions = _snapshot_sessions(sessions)
+        with self._latest_lock:
+            delivery_pending = self._latest_sessions is not None
+            self._latest_sessions = sessions
+        if not delivery_pending and self.gui_window:
+            try:
+                self.gui_window.root.event_generate("<<SessionsUpdated>>", when="tail")
+            except Exception:
+                # 通知できなかった一覧をスロットに残すと、以降の周期が「通知済み」と判断して
+                # 二度と通知しなくなるので空に戻し、次の周期は変化がなくても改めて渡す
+                with self._latest_lock:
+                    self._latest_sessions = None
+                self._published_keys = None
+                raise
+
+    def _deliver_latest(self, event=None):
+        """メインスレッドで最新のセッション一覧をGUIに反映（<<SessionsUpdated>>のハンドラ）"""
+        with self._latest_lock:
+            updated_sessions = self._latest_sessions
+            self._latest_sessions = None
+        if updated_sessions is None:
+            return
 
-    def _check_updates(self):
-        """メインスレッドでキューをチェックしてGUI更新（定期実行）"""
         try:
-            # キューからデータを取得（ブロックしない）
-            while not self.update_queue.empty():
-                updated_sessions = self.update_queue.get_nowait()
-                print(f"  [MainThread] Processing update from queue: {len(updated_sessions)} sessions")
-
-                if self.gui_window:
-                    self.gui_window.update_sessions(updated_sessions)
-                    print(f"  [MainThread] GUI updated successfully")
-        except queue.Empty:
-            pass
+            log.debug("  [MainThread] Processing update: %s sessions", len(updated_sessions))
+            if self.gui_window:
+                self.gui_window.update_sessions(updated_sessions)
+                log.debug("  [MainThread] GUI updated successfully")
         except Exception as e:
-            print(f"Error in _check_updates: {e}")
-            import traceback
-            traceback.print_exc()
-
-        # 次回のチェックをスケジュール（メインスレッドで実行）
-        if self.is_running and self.gui_window:
-            self.gui_window.root.after(100, self._check_updates)  # 100ms後に再実行
+            log.exception("Error in _deliver_latest: %s", e)
 
     def update_loop(self):
         """定期的にセッション情報を更新するループ"""
+        # ループ内で毎回参照するメソッド・辞書はローカル変数に束縛しておく
+        # （session_mapと_content_hash_mapは再代入されず、このスレッドだけが中身を更新する）
+        detect = self.terminal_monitor.detect_sessions_with_contents
+        analyze = self.terminal_monitor.analyze_session_status
+        session_map = self.session_map
+        content_hash_map = self._content_hash_map
+
         iteration = 0
+        interval = UPDATE_INTERVAL  # 変化がない周期が続くと倍々に延ばし、変化があれば元に戻す
         while self.is_running:
             try:
-                # 強制更新フラグがセットされている場合は即座に実行
-                if self.force_update_flag:
-                    print(f"\n[FORCE UPDATE] Executing forced update...")
-                    self.force_update_flag = False
-                else:
-                    # 通常は1秒待機
-                    time.sleep(UPDATE_INTERVAL / 1000)
+                # 更新間隔だけ待機（強制更新・要約完了が通知されたら即座に起きる）
+                forced = self._wake.wait(timeout=interval / 1000)
+                if forced:
+                    self._wake.clear()
+                    if not self.is_running:
+                        break
+                    log.debug("[FORCE UPDATE] Executing forced update...")
 
                 iteration += 1
-                print(f"\n[Update {iteration}] Detecting sessions...")
-
-                # セッションを再検出
-                new_sessions = self.terminal_monitor.detect_sessions()
-                print(f"  Found {len(new_sessions)} sessions")
+                log.debug("[Update %s] Detecting sessions...", iteration)
 
-                # Claude Codeセッションのみを抽出
-                claude_sessions = [s for s in new_sessions if s.is_running_claude]
-                print(f"  Claude Code sessions: {len(claude_sessions)}")
-
-                # 各セッションの詳細を分析
-                updated_sessions = []
-                for new_session in claude_sessions:
-                    session_key = (new_session.window_id, new_session.tab_index)
-
-                    # 既存セッションがあれば再利用
-                    if session_key in self.session_map:
-                        existing_session = self.session_map[session_key]
-                        print(f"  Session: {new_session.display_name} (window_id={new_session.window_id}) [Reusing existing]")
-                        # 既存セッションの状態を新セッションに引き継ぐ
-                        new_session.previous_output = existing_session.previous_output
-                        new_session.summary = existing_session.summary
-                        new_session.last_trigger_state = existing_session.last_trigger_state
-                        new_session.display_order = existing_session.display_order  # 表示順序も引き継ぐ
-                    else:
-                        # 新規セッション: display_orderを割り当てて末尾に追加
-                        new_session.display_order = self.next_display_order
-                        self.next_display_order += 1
-                        print(f"  Session: {new_session.display_name} (window_id={new_session.window_id}) [New session, display_order={new_session.display_order}]")
+                # GUIでの並び替え結果を反映
+                self._apply_reorder_requests()
 
-                    print(f"    Before analysis - Output length: {len(new_session.last_output)}")
+                # 前回以降に完了した要約を反映
+                summaries_applied = self._apply_summary_results()
 
-                    # Claude Codeセッションは詳細分析
-                    print(f"    Analyzing session content...")
-                    updated_session = self.terminal_monitor.analyze_session_status(new_session)
-                    print(f"    After analysis - Status: {updated_session.status}, Output length: {len(updated_session.last_output)}")
-                    print(f"    Output preview: {updated_session.last_output[:100]!r}")
+                # GUI更新が必要かどうか（強制更新・起動時・要約反映時は必ず更新）
+                any_changed = forced or self.is_first_update or summaries_applied
 
-                    # 出力の末尾1000文字を比較（スクロール変動を無視）
-                    current_tail = updated_session.last_output[-1000:] if len(updated_session.last_output) > 1000 else updated_session.last_output
-                    previous_tail = updated_session.previous_output[-1000:] if len(updated_session.previous_output) > 1000 else updated_session.previous_output
-                    output_changed = current_tail != previous_tail
+                # Claude Codeセッションの再検出と内容取得を1回のAppleScriptで行う
+                claude_sessions, tab_contents = detect(claude_only=True)
+                log.debug("  Claude Code sessions: %s", len(claude_sessions))
 
-                    # 前回のセッション状態を取得（新規セッションの判定にも使用）
-                    is_new_session = session_key not in self.session_map
+                # 各セッションの詳細を分析
+                updated_sessions = {}
+                for detected_session in claude_sessions:
+                    session_key = detected_session.key
+
+                    # 既存セッションがあればオブジェクトごと再利用し、検出結果（タブ名など）だけ更新する
+                    # （状態・idle_check_count・要約・表示順序などはそのまま保持される）
+                    existing_session = session_map.get(session_key)
+                    is_new_session = existing_session is None
                     if not is_new_session:
-                        previous_status = self.session_map[session_key].status
+                        log.debug("  Session: %s (window_id=%s) [Reusing existing]", detected_session.display_name, detected_session.window_id)
+                        updated_session = existing_session
+                        previous_status = updated_session.status
+                        tab_name_changed = updated_session.tab_name != detected_session.tab_name
+                        updated_session.tab_name = detected_session.tab_name
+                        updated_session.is_running_claude = detected_session.is_running_claude
                     else:
+                        # 新規セッション: display_orderを割り当てて末尾に追加
+                        updated_session = detected_session
                         previous_status = None
-                        print(f"    [NEW SESSION] Detected new session, will not trigger speech")
+                        tab_name_changed = False
+                        updated_session.display_order = self.next_display_order
+                        self.next_display_order += 1
+                        self._ordered_keys.append(session_key)  # 最大のdisplay_orderなので末尾に追加
+                        log.debug("  Session: %s (window_id=%s) [New session, display_order=%s]", updated_session.display_name, updated_session.window_id, updated_session.display_order)
+                        log.debug("    [NEW SESSION] Detected new session, will not trigger speech")
+
+                    # タブ内容が前回と同じなら再解析せず前回の結果をそのまま使う
+                    # （active→idleの2回目チェック待ちの場合は必ず再解析）
+                    content = tab_contents.get(session_key, "")
+                    content_hash = hash(content)
+                    if (is_new_session or
+                            content_hash_map.get(session_key) != content_hash or
+                            updated_session.idle_check_count != 0):
+                        # Claude Codeセッションは詳細分析
+                        analyze(updated_session, content)
+                        content_hash_map[session_key] = content_hash
+                        log.debug("    Analyzed - Status: %s, Output length: %s", updated_session.status, len(updated_session.last_output))
+
+                    # 出力の末尾1000文字のハッシュを比較（スクロール変動を無視）
+                    output_changed = updated_session.tail_hash != updated_session.previous_tail_hash
 
                     current_status = updated_session.status
 
+                    if is_new_session or output_changed or current_status != previous_status or tab_name_changed:
+                        any_changed = True
+
                     # 起動時は必ず要約を生成、それ以外は状態がidleまたはwaitingに切り替わった時のみ
                     status_changed_to_idle_or_waiting = (
                         previous_status is not None and
                         previous_status != current_status and
-                        (current_status == "idle" or current_status == "waiting")
+                        current_status in _TRIGGER_STATES
                     )
 
-                    if output_changed:
-                        print(f"    Output changed (prev: {len(updated_session.previous_output)} -> now: {len(updated_session.last_output)})")
+                    # active→idleの確定は出力が変わらない周期に起こり得るので、状態変化だけでも要約対象にする
+                    if output_changed or status_changed_to_idle_or_waiting:
+                        log.debug("    Output changed (tail crc: %08x -> %08x)", updated_session.previous_tail_hash, updated_session.tail_hash)
 
                         # 起動時は必ず要約生成、それ以外は状態変化時のみ
                         if self.is_first_update or status_changed_to_idle_or_waiting:
                             if self.is_first_update:
-                                print(f"    Initial startup: generating summary...")
+                                log.debug("    Initial startup: generating summary...")
                             else:
-                                print(f"    Status changed: {previous_status} -> {current_status}, generating summary...")
-
-                            # 要約を生成
-                            updated_session.summary = self.claude_parser.summarize(updated_session.last_output)
-                            print(f"    Summary generated: {updated_session.summary[:50]}...")
-                            updated_session.last_trigger_state = current_status
+                                log.debug("    Status changed: %s -> %s, generating summary...", previous_status, current_status)
 
+                            # 要約をワーカーに依頼（完了までは前回の要約を表示）
                             # 要約生成完了後に読み上げ（起動時以外、かつ新規セッションでない場合のみ）
-                            if not self.is_first_update:
-                                if self.gui_window and previous_status and not is_new_session:
-                                    print(f"    [TTS] Triggering speech for status change (after summary)")
-                                    self.gui_window.speak_status_change(updated_session, previous_status)
-                                elif is_new_session:
-                                    print(f"    [TTS] Skipping speech - new session detected")
+                            speak = not self.is_first_update and bool(previous_status) and not is_new_session
+                            if not self.is_first_update and is_new_session:
+                                log.debug("    [TTS] Skipping speech - new session detected")
+                            self._request_summary(session_key, updated_session.last_output, previous_status, speak)
+                            if not updated_session.summary:
+                                updated_session.summary = "~要約中~"
+                            updated_session.last_trigger_state = current_status
                         else:
-                            print(f"    Status: {current_status} (no state change to idle/waiting), keeping previous summary")
+                            log.debug("    Status: %s (no state change to idle/waiting), keeping previous summary", current_status)
 
-                        # 前回の出力を更新
-                        updated_session.previous_output = updated_session.last_output
+                        # 比較に使うのは末尾のハッシュのみなので、前回の出力自体は保持しない
+                        updated_session.previous_tail_hash = updated_session.tail_hash
                     else:
-                        print(f"    Output unchanged, no summary update needed")
+                        log.debug("    Output unchanged, no summary update needed")
 
                     # セッションマップを更新
-                    self.session_map[session_key] = updated_session
-                    updated_sessions.append(updated_session)
+                    session_map[session_key] = updated_session
+                    updated_sessions[session_key] = updated_session
+
+                # 閉じられたタブのセッションを破棄（検出が空の場合はAppleScriptの失敗もあり得るので残す）
+                if updated_sessions and len(session_map) > len(updated_sessions):
+                    self._evict_closed_sessions(updated_sessions)
+
+                # display_order順に並べる（並び順はキーリストで管理しているのでソート不要）
+                published_keys = [key for key in self._ordered_keys if key in updated_sessions]
+                updated_sessions_sorted = [updated_sessions[key] for key in published_keys]
+
+                # セッションの増減もなく、どのセッションも変化していなければGUI更新を省略
+                if published_keys != self._published_keys:
+                    any_changed = True
+                self._published_keys = published_keys
 
-                # display_order順にソート
-                updated_sessions_sorted = sorted(updated_sessions, key=lambda s: s.display_order)
+                if not any_changed:
+                    interval = min(interval * 2, MAX_UPDATE_INTERVAL)
+                    log.debug("  No changes, skipping GUI update (next check in %sms)", interval)
+                    continue
+                interval = UPDATE_INTERVAL
 
                 # デバッグ: GUI更新前の最終確認
-                print(f"  Passing {len(updated_sessions_sorted)} sessions to GUI queue (sorted by display_order):")
-                for i, s in enumerate(updated_sessions_sorted):
-                    print(f"    [{i+1}] display_order={s.display_order}, {s.display_name}: output_len={len(s.last_output)}")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("  Passing %s sessions to GUI (sorted by display_order):", len(updated_sessions_sorted))
+                    for i, s in enumerate(updated_sessions_sorted):
+                        log.debug("    [%s] display_order=%s, %s: output_len=%s", i+1, s.display_order, s.display_name, len(s.last_output))
 
-                # キューに更新データを投入（スレッドセーフ）
-                self.update_queue.put(updated_sessions_sorted)
-                print("  Data added to update queue")
+                # 最新のセッション一覧を渡し、メインスレッドでの反映を予約
+                self._publish_sessions(updated_sessions_sorted)
+                log.debug("  Sessions published to GUI")
 
                 # 起動時フラグをクリア
                 if self.is_first_update:
                     self.is_first_update = False
-                    print("  [STARTUP] First update completed, initial summaries generated")
+                    log.debug("  [STARTUP] First update completed, initial summaries generated")
 
             except Exception as e:
-                print(f"Error in update loop: {e}")
-                import traceback
-                traceback.print_exc()
-                # エラー時も待機を継続
-                time.sleep(UPDATE_INTERVAL / 1000)
+                log.exception("Error in update loop: %s", e)
+                # 待機はループ先頭の_wake.waitで行う（停止・強制更新で即座に起きられるようにする）
 
     def on_session_clicked(self, session: TerminalSession):
         """セッションがクリックされたときの処理"""
-        print(f"\n[CLICK] ===== on_session_clicked called =====")
-        print(f"  display_name: {session.display_name}")
-        print(f"  window_id: {session.window_id}")
-        print(f"  tab_index: {session.tab_index}")
-        print(f"  tab_name: {session.tab_name}")
-
-        # 現在のウィンドウフォーカス状態をチェック
-        if self.gui_window:
-            try:
-                focus_widget = self.gui_window.root.focus_get()
-                print(f"  [FOCUS] Current focus widget: {focus_widget}")
-            except Exception as e:
-                print(f"  [FOCUS] Could not get focus widget: {e}")
+        log.debug("[CLICK] ===== on_session_clicked called =====")
+        log.debug("  display_name: %s", session.display_name)
+        log.debug("  window_id: %s", session.window_id)
+        log.debug("  tab_index: %s", session.tab_index)
+        log.debug("  tab_name: %s", session.tab_name)
+
+        # osascriptの完了待ちでGUIが固まらないよう、切り替えはワーカースレッドで行う
+        # （ワーカーは1つなので、連続クリックでもクリックした順に切り替わり、最後にクリックしたタブが前面に残る）
+        self._switch_executor.submit(self._switch_session_worker, session)
 
-        print(f"[CLICK] Calling switch_to_session...")
+        log.debug("[CLICK] ===== on_session_clicked done =====")
+
+    def _switch_session_worker(self, session: TerminalSession):
+        """ワーカースレッドでセッションを切り替え、結果をメインスレッドに返す"""
+        log.debug("[CLICK] Calling switch_to_session...")
         success = self.terminal_monitor.switch_to_session(
             session.window_id,
             session.tab_index
         )
-        print(f"[CLICK] switch_to_session returned: {success}")
-
-        # フォーカスチェックのみ（強制的には奪わない）
-        if self.gui_window:
-            try:
-                focus_widget = self.gui_window.root.focus_get()
-                print(f"  [FOCUS-AFTER] Focus widget after switch: {focus_widget}")
-            except Exception as e:
-                print(f"  [FOCUS-AFTER] Could not get focus: {e}")
+        log.debug("[CLICK] switch_to_session returned: %s", success)
+        if self.gui_window and self.is_running:
+            self.gui_window.root.after(0, self._on_switch_done, session, success)
 
+    def _on_switch_done(self, session: TerminalSession, success: bool):
+        """セッション切り替え完了時の処理（メインスレッド）"""
         if success:
-            print(f"[CLICK] Switch successful (background mode - GUI keeps focus)")
+            log.debug("[CLICK] Switch successful (background mode - GUI keeps focus)")
 
             self.gui_window.show_notification(
                 f"Switched to {session.display_name}",
                 "success"
             )
         else:
-            print(f"[CLICK] Switch FAILED")
+            log.warning("[CLICK] Switch FAILED")
             self.gui_window.show_notification(
                 "Failed to switch session",
                 "error"
             )
 
-        print(f"[CLICK] ===== on_session_clicked done =====\n")
-
     def on_reorder_complete(self, sessions: List[TerminalSession]):
         """GUIでカードの並び替えが完了したときの処理"""
-        print(f"\n[REORDER] ===== on_reorder_complete called =====")
-        # session_mapのdisplay_orderを更新
-        for session in sessions:
-            session_key = (session.window_id, session.tab_index)
-            if session_key in self.session_map:
-                self.session_map[session_key].display_order = session.display_order
-                print(f"  Updated session_map: {session.display_name}, display_order={session.display_order}")
-        print(f"[REORDER] ===== on_reorder_complete done =====\n")
+        log.debug("[REORDER] ===== on_reorder_complete called =====")
+        # session_mapは更新スレッドが所有しているので、並び順を渡して次の周期で反映させる
+        self._reorder_requests.put([(s.key, s.display_order) for s in sessions])
+        log.debug("[REORDER] ===== on_reorder_complete done =====")
 
     def on_force_update(self):
         """GUIから強制更新を要求されたときの処理"""
-        print(f"\n[FORCE UPDATE] Force update requested")
-        self.force_update_flag = True
+        log.debug("[FORCE UPDATE] Force update requested")
+        self._wake.set()
 
 
 def check_dependencies():
@@ -347,6 +480,11 @@ def check_dependencies():
 
 def main():
     """メインエントリーポイント"""
+    logging.basicConfig(
+        level=logging.DEBUG if os.environ.get("CCMON_DEBUG") else logging.WARNING,
+        format="%(message)s"
+    )
+
     print("=" * 50)
     print("Claude Code Monitor")
     print("=" * 50)
@@ -361,9 +499,7 @@ def main():
     try:
         controller.start()
     except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error: %s", e)
         sys.exit(1)
 
 
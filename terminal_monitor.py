@@ -1,58 +1,49 @@
 """
 Terminal.appのウィンドウとタブを監視・制御するモジュール
 """
+import atexit
+import logging
+import os
 import subprocess
+import tempfile
+import threading
 import re
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+import sys
+import zlib
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
+# ロガー（main.pyと共通、CCMON_DEBUG=1でデバッグ出力を有効化）
+log = logging.getLogger("ccmon")
 
-@dataclass
-class TerminalSession:
-    """Terminal.appのセッション情報"""
-    window_id: int
-    tab_index: int
-    tab_name: str
-    is_running_claude: bool
-    last_output: str
-    status: str  # "active", "waiting", "idle", "error"
-    todo_progress: Optional[str]  # "3/5 completed"
-    last_updated: datetime
-    summary: str = ""  # Claude APIによる要約
-    previous_output: str = ""  # 前回の出力（変更検知用）
-    needs_summary: bool = False  # 要約が必要かどうか
-    last_trigger_state: str = ""  # 前回のトリガー状態（重複要約防止用）
-    display_order: int = 0  # ユーザー定義の表示順序（ドラッグ&ドロップ用）
-    idle_check_count: int = 0  # アイドル判定の連続カウント（activeからidleへの変化を2回チェック）
 
-    @property
-    def display_name(self) -> str:
-        """表示用の名前（Claude Codeセッション用）"""
-        # シンプルにタブ名のみを表示
-        # 番号付けはGUI側で行う（Claude Codeセッションのみをカウント）
-        return self.tab_name
+# セッションに保持する出力の上限（要約APIに送るのも最新10000文字までなので、それ以上は保持しない）
+MAX_OUTPUT_CHARS = 10000
 
 
-class TerminalMonitor:
-    """Terminal.appを監視・制御するクラス"""
+def extract_recent_relevant_lines(output: str, count: int = 3) -> tuple:
+    """
+    出力の末尾から、空行と'$'で始まる行を除いた最新N行を取得
 
-    def __init__(self):
-        self.sessions: List[TerminalSession] = []
+    全文をsplitせず末尾から走査するため、出力が長くてもコストは一定
+    """
+    output = output.strip()
+    relevant_lines = []
+    end = len(output)
+    while end > 0 and len(relevant_lines) < count:
+        start = output.rfind('\n', 0, end) + 1
+        line = output[start:end]
+        if line.strip() and not line.startswith('$'):
+            relevant_lines.append(line)
+        end = start - 1
+    relevant_lines.reverse()
+    return tuple(relevant_lines)
 
-    def detect_sessions(self) -> List[TerminalSession]:
-        """
-        Terminal.appの全ウィンドウ・タブを検出し、Claude Codeセッションを識別
-        """
-        sessions = []
 
-        # AppleScriptでTerminal.appの情報を取得
-        script = '''
-        tell application "Terminal"
-            set output to ""
-            repeat with w from 1 to count of windows
-                set win_id to id of window w
-                repeat with t from 1 to count of tabs of window w
+# 1タブ分の情報（WINDOW_ID/WINDOW_INDEX/TAB/NAME/PROCESSES/ACTIVE）をtab_infoに組み立てるAppleScript
+# 変数w（ウィンドウ番号）、t（タブ番号）、win_id（ウィンドウ固有ID）が定義済みのループ内で使用する
+_TAB_INFO_SCRIPT = '''
                     set tab_info to ""
                     set tab_info to tab_info & "WINDOW_ID:" & win_id & "|"
                     set tab_info to tab_info & "WINDOW_INDEX:" & w & "|"
@@ -107,6 +98,175 @@ class TerminalMonitor:
                         set tab_info to tab_info & "ACTIVE:false|"
                     end try
 
+'''
+
+
+def session_key(window_id: int, tab_index: int) -> int:
+    """(window_id, tab_index)を辞書キー用の1つの整数に畳み込む"""
+    return (window_id << 16) | (tab_index & 0xFFFF)
+
+
+def _last_lines(text: str, count: int) -> str:
+    """末尾count行を返す（行数がcount以下なら分割せずそのまま返す）"""
+    if text.count('\n') < count:
+        return text
+    return '\n'.join(text.rsplit('\n', count)[1:])
+
+
+# Claude Code判定用（'claude-code'・'npx claude'も'claude'を含むので1パターンで判定できる）
+_CLAUDE_RE = re.compile(r'claude', re.IGNORECASE)
+
+# 区切り線（10文字以上の─────があれば区切り線と判定）
+_SEPARATOR = '─' * 10
+
+
+def _last_separator_lines(content: str, count: int) -> List[Tuple[int, int]]:
+    """
+    末尾から区切り線を含む行を最大count本探し、(行頭, 行末)を下から順に返す
+
+    全文をsplitせず末尾からrfindで探すため、走査は最後の区切り線までで済む
+    """
+    found = []
+    end = len(content)
+    while len(found) < count:
+        pos = content.rfind(_SEPARATOR, 0, end)
+        if pos == -1:
+            break
+        line_start = content.rfind('\n', 0, pos) + 1
+        line_end = content.find('\n', pos)
+        if line_end == -1:
+            line_end = len(content)
+        found.append((line_start, line_end))
+        end = line_start
+    return found
+
+
+# セッション切り替え用AppleScript（引数: ウィンドウ固有ID、タブ番号（1始まり））
+_SWITCH_SCRIPT = '''
+on run argv
+    set target_id to (item 1 of argv) as integer
+    set target_tab to (item 2 of argv) as integer
+    tell application "Terminal"
+        -- 固有IDでウィンドウを検索
+        set targetWindow to window id target_id
+
+        -- ターミナルを前面に表示
+        activate
+
+        -- ウィンドウを前面に（Terminal内での順序）
+        log "Switching to window with ID " & target_id
+        set index of targetWindow to 1
+
+        -- タブを選択（1始まり）
+        log "Selecting tab " & target_tab & " of target window"
+        set selected of tab target_tab of targetWindow to true
+
+        return "success"
+    end tell
+end run
+'''
+
+
+# タブ内容取得用AppleScript（引数: ウィンドウ固有ID、タブ番号（1始まり））
+_TAB_CONTENT_SCRIPT = '''
+on run argv
+    set target_id to (item 1 of argv) as integer
+    set target_tab to (item 2 of argv) as integer
+    tell application "Terminal"
+        try
+            set targetWindow to window id target_id
+            set tab_contents to contents of tab target_tab of targetWindow
+            return tab_contents
+        on error errMsg
+            return "ERROR: " & errMsg
+        end try
+    end tell
+end run
+'''
+
+
+# タブを選択してテキストを送信するAppleScript（引数: ウィンドウ固有ID、タブ番号（1始まり）、送信テキスト）
+# 切り替えと送信を1回のosascript呼び出しで行う。テキストはargvで渡すため、エスケープ処理は不要
+# （"-"で始まるテキストがosascriptのオプションと解釈されないよう、数値の引数を先に渡す）
+_SEND_TEXT_SCRIPT = '''
+on run argv
+    set target_id to (item 1 of argv) as integer
+    set target_tab to (item 2 of argv) as integer
+    set send_text to item 3 of argv
+    tell application "Terminal"
+        set targetWindow to window id target_id
+
+        -- switch_to_sessionと同じ手順でタブを前面に表示
+        activate
+        set index of targetWindow to 1
+        set selected of tab target_tab of targetWindow to true
+
+        do script send_text in tab target_tab of targetWindow
+    end tell
+end run
+'''
+
+
+# TerminalSessionは__slots__化してインスタンスごとの__dict__を持たせない（slots=TrueはPython 3.10以降）
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class TerminalSession:
+    """Terminal.appのセッション情報"""
+    window_id: int
+    tab_index: int
+    tab_name: str
+    is_running_claude: bool
+    last_output: str
+    status: str  # "active", "waiting", "idle", "error"
+    todo_progress: Optional[str]  # "3/5 completed"
+    last_updated: datetime
+    summary: str = ""  # Claude APIによる要約
+    tail_hash: int = 0  # last_output末尾1000文字のCRC32（書き込み時に計算）
+    previous_tail_hash: int = 0  # 前回のtail_hash（変更検知用、空文字列のCRC32は0）
+    needs_summary: bool = False  # 要約が必要かどうか
+    last_trigger_state: str = ""  # 前回のトリガー状態（重複要約防止用）
+    display_order: int = 0  # ユーザー定義の表示順序（ドラッグ&ドロップ用）
+    idle_check_count: int = 0  # アイドル判定の連続カウント（activeからidleへの変化を2回チェック）
+    recent_relevant_lines: tuple = ()  # last_outputの最新の有効行（GUIのフォールバック表示用、書き込み時に計算）
+    key: int = field(init=False)  # セッション識別キー（window_idとtab_indexを1つの整数に畳み込んだもの）
+
+    def __post_init__(self):
+        self.key = session_key(self.window_id, self.tab_index)
+
+    @property
+    def display_name(self) -> str:
+        """表示用の名前（Claude Codeセッション用）"""
+        # シンプルにタブ名のみを表示
+        # 番号付けはGUI側で行う（Claude Codeセッションのみをカウント）
+        return self.tab_name
+
+
+class TerminalMonitor:
+    """Terminal.appを監視・制御するクラス"""
+
+    def __init__(self):
+        self.sessions: List[TerminalSession] = []
+        self._compiled_scripts: Dict[str, str] = {}  # {スクリプト: コンパイル済み.scptのパス（""はコンパイル失敗）}
+        self._compile_lock = threading.Lock()  # 更新スレッドと切り替えワーカーから同時に呼ばれるため
+
+    def detect_sessions(self, claude_only: bool = False) -> List[TerminalSession]:
+        """
+        Terminal.appの全ウィンドウ・タブを検出し、Claude Codeセッションを識別
+
+        claude_only: Trueの場合、Claude Codeが動いていないタブはパース時に除外する
+        """
+        sessions = []
+
+        # AppleScriptでTerminal.appの情報を取得
+        script = '''
+        tell application "Terminal"
+            set output to ""
+            repeat with w from 1 to count of windows
+                set win_id to id of window w
+                repeat with t from 1 to count of tabs of window w
+''' + _TAB_INFO_SCRIPT + '''
                     set output to output & tab_info & "\\n"
                 end repeat
             end repeat
@@ -116,23 +276,23 @@ class TerminalMonitor:
 
         try:
             result = subprocess.run(
-                ['osascript', '-e', script],
+                ['osascript', *self._script_args(script)],
                 capture_output=True,
                 text=True,
                 timeout=5
             )
 
             if result.returncode == 0:
-                sessions = self._parse_terminal_info(result.stdout)
+                sessions = self._parse_terminal_info(result.stdout, claude_only)
         except subprocess.TimeoutExpired:
-            print("Warning: Terminal detection timeout")
+            log.warning("Warning: Terminal detection timeout")
         except Exception as e:
-            print(f"Error detecting sessions: {e}")
+            log.warning("Error detecting sessions: %s", e)
 
         self.sessions = sessions
         return sessions
 
-    def _parse_terminal_info(self, output: str) -> List[TerminalSession]:
+    def _parse_terminal_info(self, output: str, claude_only: bool = False) -> List[TerminalSession]:
         """AppleScriptの出力をパース"""
         sessions = []
 
@@ -140,109 +300,135 @@ class TerminalMonitor:
             if not line:
                 continue
 
-            parts = {}
-            for part in line.split('|'):
-                if ':' in part:
-                    key, value = part.split(':', 1)
-                    parts[key] = value
-
-            if 'WINDOW_ID' in parts and 'TAB' in parts:
-                window_id = int(parts['WINDOW_ID'])  # 固有ID（z-orderに依存しない）
-                window_index = int(parts['WINDOW_INDEX'])  # 現在のz-order位置
-                tab_index = int(parts['TAB']) - 1  # 0始まりに変換
-                tab_name = parts.get('NAME', 'Unknown')
-                processes = parts.get('PROCESSES', '')
-
-                # デバッグ: AppleScriptから取得した情報を詳細にログ出力
-                print(f"[TERMINAL-PARSE] Raw: WINDOW_ID={parts['WINDOW_ID']}, WINDOW_INDEX={parts['WINDOW_INDEX']}, TAB={parts['TAB']}, NAME={tab_name}")
-                print(f"[TERMINAL-PARSE] Parsed: window_id={window_id} (fixed ID), window_index={window_index} (z-order), tab_index={tab_index}")
-
-                # Claude Codeが動いているか簡易チェック（タブ名とプロセスの両方で判定）
-                is_claude = self._check_if_claude_running(tab_name) or self._check_if_claude_running(processes)
-
-                session = TerminalSession(
-                    window_id=window_id,
-                    tab_index=tab_index,
-                    tab_name=tab_name,
-                    is_running_claude=is_claude,
-                    last_output="",
-                    status="idle",
-                    todo_progress=None,
-                    last_updated=datetime.now()
-                )
+            session = self._parse_tab_info(line, claude_only)
+            if session is not None:
                 sessions.append(session)
-                print(f"[TERMINAL-PARSE] Created session: {session.display_name} (window_id={window_id}, tab_index={tab_index}, is_claude={is_claude})")
 
         return sessions
 
+    def _parse_tab_info(self, line: str, claude_only: bool = False) -> Optional[TerminalSession]:
+        """
+        1タブ分のtab_info（"KEY:VALUE|..."）をパース（claude_onlyならClaude Code以外はNone）
+
+        _TAB_INFO_SCRIPTの出力順（WINDOW_ID, WINDOW_INDEX, TAB, NAME, PROCESSES, ACTIVE）は固定なので、
+        split・dictを作らずpartition/rfindで位置から切り出す
+        """
+        if not line.startswith('WINDOW_ID:'):
+            return None
+        window_id_str, _, rest = line[10:].partition('|')
+        window_index_part, _, rest = rest.partition('|')
+        tab_part, _, rest = rest.partition('|')
+        if not tab_part.startswith('TAB:'):
+            return None
+        window_index_str = window_index_part[13:]  # "WINDOW_INDEX:"を除く
+        tab_str = tab_part[4:]  # "TAB:"を除く
+
+        # 残りは "NAME:...|PROCESSES:...|ACTIVE:...|"（PROCESSESは取得できた場合のみ）
+        # タブ名に"|"が含まれても崩れないよう、末尾側から区切りを探す
+        name_end = rest.rfind('|ACTIVE:')
+        if name_end == -1:
+            name_end = len(rest) - 1 if rest.endswith('|') else len(rest)
+        processes_pos = rest.rfind('|PROCESSES:', 0, name_end)
+        if processes_pos != -1:
+            processes = rest[processes_pos + 11:name_end]
+            name_end = processes_pos
+        else:
+            processes = ''
+        tab_name = rest[5:name_end] if rest.startswith('NAME:') else 'Unknown'
+
+        window_id = int(window_id_str)  # 固有ID（z-orderに依存しない）
+        window_index = int(window_index_str)  # 現在のz-order位置
+        tab_index = int(tab_str) - 1  # 0始まりに変換
+
+        # デバッグ: AppleScriptから取得した情報を詳細にログ出力
+        log.debug("[TERMINAL-PARSE] Raw: WINDOW_ID=%s, WINDOW_INDEX=%s, TAB=%s, NAME=%s", window_id_str, window_index_str, tab_str, tab_name)
+        log.debug("[TERMINAL-PARSE] Parsed: window_id=%s (fixed ID), window_index=%s (z-order), tab_index=%s", window_id, window_index, tab_index)
+
+        # Claude Codeが動いているか簡易チェック（タブ名とプロセスの両方で判定）
+        is_claude = self._check_if_claude_running(tab_name) or self._check_if_claude_running(processes)
+        if claude_only and not is_claude:
+            return None
+
+        session = TerminalSession(
+            window_id=window_id,
+            tab_index=tab_index,
+            tab_name=tab_name,
+            is_running_claude=is_claude,
+            last_output="",
+            status="idle",
+            todo_progress=None,
+            last_updated=datetime.now()
+        )
+        log.debug("[TERMINAL-PARSE] Created session: %s (window_id=%s, tab_index=%s, is_claude=%s)", session.display_name, window_id, tab_index, is_claude)
+        return session
+
     def _check_if_claude_running(self, tab_name: str) -> bool:
         """タブ名からClaude Codeが実行中か判定"""
-        claude_keywords = ['claude', 'claude-code', 'npx claude']
-        return any(keyword in tab_name.lower() for keyword in claude_keywords)
+        return _CLAUDE_RE.search(tab_name) is not None
 
     def switch_to_session(self, window_id: int, tab_index: int) -> bool:
         """指定されたウィンドウ・タブに切り替え（ターミナルを前面に表示）"""
-        print(f"[DEBUG] switch_to_session called: window_id={window_id} (fixed ID), tab_index={tab_index}")
+        log.debug("[DEBUG] switch_to_session called: window_id=%s (fixed ID), tab_index=%s", window_id, tab_index)
 
         # ターミナルを前面に表示し、指定されたウィンドウとタブを選択
-        script = f'''
-        tell application "Terminal"
-            -- 固有IDでウィンドウを検索
-            set targetWindow to first window whose id is {window_id}
-
-            -- ターミナルを前面に表示
-            activate
-
-            -- ウィンドウを前面に（Terminal内での順序）
-            log "Switching to window with ID " & {window_id}
-            set index of targetWindow to 1
-
-            -- タブを選択（1始まり）
-            log "Selecting tab " & {tab_index + 1} & " of target window"
-            set selected of tab {tab_index + 1} of targetWindow to true
-
-            return "success"
-        end tell
-        '''
-
         try:
             result = subprocess.run(
-                ['osascript', '-e', script],
+                ['osascript', *self._script_args(_SWITCH_SCRIPT), str(window_id), str(tab_index + 1)],
                 capture_output=True,
                 text=True,
                 timeout=5
             )
-            print(f"[DEBUG] AppleScript result:")
-            print(f"  returncode: {result.returncode}")
-            print(f"  stdout: {result.stdout!r}")
-            print(f"  stderr: {result.stderr!r}")
+            log.debug("[DEBUG] AppleScript result:")
+            log.debug("  returncode: %s", result.returncode)
+            log.debug("  stdout: %r", result.stdout)
+            log.debug("  stderr: %r", result.stderr)
 
             success = result.returncode == 0
-            print(f"[DEBUG] switch_to_session returning: {success}")
+            log.debug("[DEBUG] switch_to_session returning: %s", success)
             return success
         except Exception as e:
-            print(f"[ERROR] Exception in switch_to_session: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[ERROR] Exception in switch_to_session: %s", e)
             return False
 
+    def _script_args(self, script: str) -> List[str]:
+        """
+        osascriptに渡すスクリプト指定を返す
+
+        初回にosacompileでコンパイルし、以降はコンパイル済みファイルを渡して毎回のスクリプト解析を省く
+        （コンパイルできなかった場合は-eでソースを渡す）
+        """
+        with self._compile_lock:
+            path = self._compiled_scripts.get(script)
+            if path is None:
+                fd, path = tempfile.mkstemp(prefix="ccmon_", suffix=".scpt")
+                os.close(fd)
+                try:
+                    result = subprocess.run(
+                        ['osacompile', '-o', path, '-e', script],
+                        capture_output=True,
+                        text=True,
+                        timeout=5
+                    )
+                    compiled = result.returncode == 0
+                    if not compiled:
+                        log.warning("osacompile failed: %s", result.stderr)
+                except Exception as e:
+                    log.warning("osacompile failed: %s", e)
+                    compiled = False
+
+                if compiled:
+                    atexit.register(os.remove, path)
+                else:
+                    os.remove(path)
+                    path = ""
+                self._compiled_scripts[script] = path
+        return [path] if path else ['-e', script]
+
     def get_tab_content(self, window_id: int, tab_index: int, line_count: int = 50) -> str:
         """指定されたタブの内容を取得（最新N行）"""
-        script = f'''
-        tell application "Terminal"
-            try
-                set targetWindow to first window whose id is {window_id}
-                set tab_contents to contents of tab {tab_index + 1} of targetWindow
-                return tab_contents
-            on error errMsg
-                return "ERROR: " & errMsg
-            end try
-        end tell
-        '''
-
         try:
             result = subprocess.run(
-                ['osascript', '-e', script],
+                ['osascript', *self._script_args(_TAB_CONTENT_SCRIPT), str(window_id), str(tab_index + 1)],
                 capture_output=True,
                 text=True,
                 timeout=5
@@ -253,56 +439,115 @@ class TerminalMonitor:
 
                 # エラーメッセージをログ出力
                 if output.startswith("ERROR:"):
-                    print(f"AppleScript error for window {window_id} tab {tab_index + 1}: {output}")
+                    log.warning("AppleScript error for window %s tab %s: %s", window_id, tab_index + 1, output)
                     return ""
 
-                lines = output.split('\n')
-                return '\n'.join(lines[-line_count:])
+                return _last_lines(output, line_count)
             else:
                 if result.stderr:
-                    print(f"stderr: {result.stderr}")
+                    log.warning("stderr: %s", result.stderr)
                 return ""
         except Exception as e:
-            print(f"Error getting tab content: {e}")
+            log.warning("Error getting tab content: %s", e)
             return ""
 
-    def send_text_to_tab(self, window_id: int, tab_index: int, text: str) -> bool:
-        """指定されたタブにテキストを送信"""
-        # まず選択
-        if not self.switch_to_session(window_id, tab_index):
-            return False
+    def detect_sessions_with_contents(self, line_count: int = 1000, claude_only: bool = False) -> Tuple[List[TerminalSession], Dict[int, str]]:
+        """
+        全ウィンドウ・タブの検出と内容取得を1回のAppleScript呼び出しで行う
 
-        # テキストを送信（エスケープ処理）
-        escaped_text = text.replace('\\', '\\\\').replace('"', '\\"')
+        claude_only: Trueの場合、Claude Codeが動いていないタブはセッション生成・内容の切り出しを行わない
 
-        script = f'''
+        Returns:
+            (セッション一覧, {session.key: 内容（最新N行）})
+        """
+        # タブごとに tab_info + US(0x1F) + 内容 + RS(0x1E) の形式で出力
+        # claude_onlyの場合、タブ名・プロセスに"claude"を含まないタブ（_check_if_claude_runningで必ず除外される）は
+        # 内容を読み出さない（AppleScriptのcontainsは大文字小文字を区別しない）
+        fetch_condition = 'tab_info contains "claude"' if claude_only else 'true'
+        script = '''
         tell application "Terminal"
-            do script "{escaped_text}" in tab {tab_index + 1} of window {window_id}
+            set output to ""
+            set field_sep to character id 31
+            set record_sep to character id 30
+            repeat with w from 1 to count of windows
+                set win_id to id of window w
+                repeat with t from 1 to count of tabs of window w
+''' + _TAB_INFO_SCRIPT + '''
+                    set tab_contents to ""
+                    if ''' + fetch_condition + ''' then
+                        try
+                            set tab_contents to contents of tab t of window w
+                        end try
+                    end if
+                    set output to output & tab_info & field_sep & tab_contents & record_sep
+                end repeat
+            end repeat
+            return output
         end tell
         '''
 
+        sessions = []
+        contents_map = {}
+        try:
+            result = subprocess.run(
+                ['osascript', *self._script_args(script)],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+
+            if result.returncode == 0:
+                for record in result.stdout.split('\x1e'):
+                    tab_info, sep, tab_contents = record.partition('\x1f')
+                    if not sep:
+                        continue
+                    session = self._parse_tab_info(tab_info.strip(), claude_only)
+                    if session is None:
+                        continue
+                    sessions.append(session)
+                    contents_map[session.key] = _last_lines(tab_contents.strip(), line_count)
+            elif result.stderr:
+                log.warning("stderr: %s", result.stderr)
+        except subprocess.TimeoutExpired:
+            log.warning("Warning: Terminal detection timeout")
+        except Exception as e:
+            log.warning("Error detecting sessions: %s", e)
+
+        self.sessions = sessions
+        return sessions, contents_map
+
+    def send_text_to_tab(self, window_id: int, tab_index: int, text: str) -> bool:
+        """指定されたタブに切り替えてテキストを送信"""
+        # 切り替えと送信を1回で行う（テキストはスクリプトには埋め込まず引数で渡す）
         try:
             result = subprocess.run(
-                ['osascript', '-e', script],
+                ['osascript', *self._script_args(_SEND_TEXT_SCRIPT), str(window_id), str(tab_index + 1), text],
                 capture_output=True,
                 text=True,
                 timeout=5
             )
             return result.returncode == 0
         except Exception as e:
-            print(f"Error sending text: {e}")
+            log.warning("Error sending text: %s", e)
             return False
 
-    def analyze_session_status(self, session: TerminalSession) -> TerminalSession:
-        """セッションの状態を分析して更新"""
-        content = self.get_tab_content(session.window_id, session.tab_index, 1000)
+    def analyze_session_status(self, session: TerminalSession, content: Optional[str] = None) -> TerminalSession:
+        """
+        セッションの状態を分析して更新
+
+        content: detect_sessions_with_contentsで取得済みのタブ内容（Noneの場合はここで取得）
+        """
+        if content is None:
+            content = self.get_tab_content(session.window_id, session.tab_index, 1000)
 
-        session.last_output = content[-20000:] if content else ""  # 最新20000文字
+        session.last_output = content[-MAX_OUTPUT_CHARS:] if content else ""
+        session.recent_relevant_lines = extract_recent_relevant_lines(session.last_output)
+        session.tail_hash = zlib.crc32(session.last_output[-1000:].encode('utf-8', 'ignore'))
         session.last_updated = datetime.now()
 
         if not content:
             session.status = "idle"
-            print(f"[DEBUG] analyze_session_status: {session.display_name} -> idle (no content)")
+            log.debug("[DEBUG] analyze_session_status: %s -> idle (no content)", session.display_name)
             return session
 
         # 選択肢チェック: ユーザー入力エリアの下部（削除される部分）に選択肢があるかチェック
@@ -311,15 +556,14 @@ class TerminalMonitor:
         # ユーザー入力エリア（─────で囲まれた範囲）を除外
         content_for_analysis = self._remove_user_input_area(content)
 
-        # 判定には最下部10行のみを使用
-        lines = content_for_analysis.split('\n')
-        last_10_lines = lines[-10:] if len(lines) >= 10 else lines
+        # 判定には最下部10行のみを使用（末尾から10行分だけ分割）
+        last_10_lines = content_for_analysis.rsplit('\n', 10)[-10:]
 
         # 全文を使用（先頭15文字の制限なし）
         analysis_text = '\n'.join(last_10_lines)
 
-        print(f"[DEBUG] analyze_session_status: {session.display_name}")
-        print(f"  Last 10 lines: {analysis_text!r}")
+        log.debug("[DEBUG] analyze_session_status: %s", session.display_name)
+        log.debug("  Last 10 lines: %r", analysis_text)
 
         # 実行中を示す文言のチェック
         has_active_keyword = '(esc to interrupt' in analysis_text
@@ -333,31 +577,31 @@ class TerminalMonitor:
         if has_options:
             session.status = "waiting"  # 選択肢あり
             session.idle_check_count = 0  # カウントリセット
-            print(f"  -> waiting (found options in input area)")
+            log.debug("  -> waiting (found options in input area)")
         elif has_active_keyword:
             # activeキーワードが見つかった場合、即座にactive判定
             session.status = "active"  # 実行中
             session.idle_check_count = 0  # カウントリセット
-            print(f"  -> active (found active keyword)")
+            log.debug("  -> active (found active keyword)")
         else:
             # activeキーワードがない場合
             # 現在activeの場合のみ、2回チェックを行う
             if session.status == "active":
                 session.idle_check_count += 1
-                print(f"  -> idle keyword found (count: {session.idle_check_count}/2)")
+                log.debug("  -> idle keyword found (count: %s/2)", session.idle_check_count)
 
                 # 2回連続でactiveキーワードがない場合のみidle判定
                 if session.idle_check_count >= 2:
                     session.status = "idle"
-                    print(f"  -> idle (confirmed after 2 checks)")
+                    log.debug("  -> idle (confirmed after 2 checks)")
                 else:
                     # 1回目はまだactive状態を維持
-                    print(f"  -> keeping active status (waiting for 2nd check)")
+                    log.debug("  -> keeping active status (waiting for 2nd check)")
             else:
                 # 元々active以外の場合は即座にidle判定
                 session.idle_check_count = 0
                 session.status = "idle"
-                print(f"  -> idle (no indicators)")
+                log.debug("  -> idle (no indicators)")
 
         return session
 
@@ -377,21 +621,13 @@ class TerminalMonitor:
             True: "1. "と"2. "の両方が見つかった
             False: 選択肢が見つからなかった、または片方のみ
         """
-        lines = content.split('\n')
-
         # 下から走査して、─────を見つける
-        separator_indices = []
-        for i, line in enumerate(lines):
-            if '─' * 10 in line:  # 10文字以上の─────があれば区切り線と判定
-                separator_indices.append(i)
+        separators = _last_separator_lines(content, 1)
 
-        if len(separator_indices) >= 1:
+        if separators:
             # 最後の区切り線より後の全てを取得
-            last_separator_end = separator_indices[-1]
-            options_area_lines = lines[last_separator_end + 1:]
-
-            # 選択肢エリア全体を1つの文字列に結合
-            options_text = '\n'.join(options_area_lines)
+            _, last_separator_end = separators[0]
+            options_text = content[last_separator_end + 1:]
 
             # "1. "と"2. "の両方が含まれているかチェック
             has_option_1 = '1. ' in options_text
@@ -411,19 +647,13 @@ class TerminalMonitor:
         ─────────────────────────────────────────────────────────────────
         """
         # 一番下から最初の─────ブロックを見つけて、それ以降を除外
-        lines = content.split('\n')
-
         # 下から走査して、─────のペアを見つける
-        separator_indices = []
-        for i, line in enumerate(lines):
-            if '─' * 10 in line:  # 10文字以上の─────があれば区切り線と判定
-                separator_indices.append(i)
+        separators = _last_separator_lines(content, 2)
 
-        if len(separator_indices) >= 2:
+        if len(separators) >= 2:
             # 最後から2番目の区切り線より前までを使用（最後のユーザー入力ブロックを除外）
-            last_separator = separator_indices[-2]
-            filtered_lines = lines[:last_separator]
-            return '\n'.join(filtered_lines)
+            line_start, _ = separators[1]
+            return content[:line_start - 1] if line_start else ""
 
         # 区切り線が見つからない場合は元のまま返す
         return content
@@ -432,13 +662,13 @@ class TerminalMonitor:
 if __name__ == "__main__":
     # テスト実行
     monitor = TerminalMonitor()
-    sessions = monitor.detect_sessions()
+    sessions, contents = monitor.detect_sessions_with_contents()
 
     print(f"Found {len(sessions)} terminal sessions:")
     for session in sessions:
         print(f"  - {session.display_name} (Claude: {session.is_running_claude})")
 
-        # 詳細分析
-        monitor.analyze_session_status(session)
+        # 詳細分析（内容は検出時にまとめて取得済み）
+        monitor.analyze_session_status(session, contents.get(session.key, ""))
         print(f"    Status: {session.status}")
         print(f"    Last output: {session.last_output[:100]}...")